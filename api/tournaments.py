@@ -1,13 +1,12 @@
 """REST API endpoints exposing TenUp tournaments."""
 from __future__ import annotations
 
-import sqlite3
 from typing import Optional
 
 from flask import Blueprint, jsonify, request
 
-from services.db_import import ensure_schema, fetch_all_tournaments
-from tenpadel.config_paths import DB_PATH
+from services.db_import import count_tournaments, fetch_all_tournaments
+from tenpadel.config_paths import DB_PATH_STR
 
 bp = Blueprint("tournaments", __name__)
 
@@ -26,17 +25,13 @@ def _parse_limit(value: Optional[str]) -> Optional[int]:
 def list_tournaments():
     limit = _parse_limit(request.args.get("limit"))
     items = fetch_all_tournaments(limit=limit)
-    return jsonify(items)
+    response = jsonify(items)
+    # Lets the healthcheck count the served list with a HEAD request (no body).
+    response.headers["X-Total-Count"] = str(len(items))
+    return response
 
 
 @bp.route("/api/_count")
 def count():
-    ensure_schema()
-    con = sqlite3.connect(str(DB_PATH))
-    cur = con.cursor()
-    cur.execute("SELECT COUNT(*) FROM tournaments")
-    total = cur.fetchone()[0]
-    cur.execute("SELECT COUNT(*) FROM tournaments WHERE COALESCE(start_date,'')!=''")
-    dated = cur.fetchone()[0]
-    con.close()
-    return jsonify({"db": str(DB_PATH), "total": total, "with_start_date": dated})
+    total, dated = count_tournaments()
+    return jsonify({"db": DB_PATH_STR, "total": total, "with_start_date": dated})
@@ -5,7 +5,6 @@ import atexit
 import csv
 import json
 import logging
-import sqlite3
 from logging.handlers import RotatingFileHandler
 import re
 import time
@@ -21,7 +20,7 @@ from loguru import logger as loguru_logger
 
 from api.tournaments import bp as tournaments_bp
 from services.scrape import scrape_tenup
-from services.db_import import ensure_schema
+from services.db_import import connect_db, ensure_schema
 from services.tournament_store import TournamentStore
 from tenpadel.config_paths import DB_PATH, JSON_PATH, LOG_DIR, ROOT
 
@@ -147,7 +146,7 @@ app.config.update(
 app.logger.info("Using database at %s", DB_PATH)
 
 try:
-    con = sqlite3.connect(str(DB_PATH))
+    con = connect_db()
     cur = con.cursor()
     cur.execute("SELECT COUNT(*) FROM tournaments")
     app.logger.info("DB boot count=%s", cur.fetchone()[0])
@@ -7,9 +7,10 @@ import re
 import time
 import unicodedata
 from datetime import date
-from typing import Callable, Iterable
+from typing import TYPE_CHECKING, Callable, Iterable
 
-from playwright.sync_api import Locator, Page
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from playwright.sync_api import Locator, Page
 
 LOGGER = logging.getLogger(__name__)
 LOGGER.addHandler(logging.NullHandler())
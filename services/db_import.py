@@ -1,14 +1,16 @@
-import json
 import logging
+import os
 import re
 import sqlite3
+import threading
 from dataclasses import dataclass
 from hashlib import sha1
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from typing import Dict, Iterable, List, Mapping, MutableMapping, Optional
 
-from tenpadel.config_paths import DB_PATH, JSON_PATH, LOG_DIR
+from tenpadel import jsonio
+from tenpadel.config_paths import DB_PATH, DB_PATH_STR, JSON_PATH, LOG_DIR
 
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 log = logging.getLogger("db_import")
@@ -36,6 +38,42 @@ DB_COLUMNS = [
     "detail_url",
     "registration_url",
 ]
+UPDATE_COLUMNS = [col for col in DB_COLUMNS if col != "detail_url"]
+SELECT_COLUMNS = ", ".join(DB_COLUMNS)
+DETAIL_URL_INDEX = DB_COLUMNS.index("detail_url")
+# Older SQLite builds cap bound parameters at 999 per statement.
+MAX_SQL_PARAMS = 900
+
+TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS tournaments(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tournament_id TEXT,
+    name TEXT,
+    level TEXT,
+    category TEXT,
+    club_name TEXT,
+    city TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    detail_url TEXT NOT NULL UNIQUE,
+    registration_url TEXT
+);
+"""
+START_DATE_INDEX_DDL = "CREATE INDEX IF NOT EXISTS idx_start_date ON tournaments(start_date)"
+# Full schema of a fresh table, for executescript.
+SCHEMA_SQL = f"{TABLE_DDL}{START_DATE_INDEX_DDL};\n"
+
+# Built once so sqlite3's per-connection statement cache reuses the prepared
+# statements across imports.
+INSERT_SQL = (
+    f"INSERT INTO tournaments({', '.join(DB_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(DB_COLUMNS))})"
+)
+UPDATE_SQL = (
+    "UPDATE tournaments SET "
+    + ", ".join(f"{col} = ?" for col in UPDATE_COLUMNS)
+    + " WHERE detail_url = ?"
+)
 
 
 @dataclass(slots=True)
@@ -59,34 +97,72 @@ class ImportStats:
         }
 
 
-def ensure_schema() -> None:
-    """Make sure the tournaments table and supporting indexes exist."""
+_SCHEMA_READY: set[str] = set()
+
+# Per-connection tuning; journal_mode=WAL is persistent and set in ensure_schema().
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
+
+
+# Only for reloading a freshly recreated table from a backed-up source: a
+# crash mid-load can lose the load, which the repair simply redoes.
+BULK_LOAD_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-200000",
+)
+
+
+def connect_db(bulk: bool = False) -> sqlite3.Connection:
+    """Open a connection to the tournaments database with the tuning PRAGMAs applied.
+
+    ``bulk=True`` applies :data:`BULK_LOAD_PRAGMAS` instead; they only last
+    as long as the returned connection.
+    """
+
+    con = sqlite3.connect(DB_PATH_STR)
+    for pragma in BULK_LOAD_PRAGMAS if bulk else CONNECTION_PRAGMAS:
+        con.execute(pragma)
+    return con
+
+
+def _has_unique_index(cur: sqlite3.Cursor, column: str, ignore: str) -> bool:
+    cur.execute("PRAGMA index_list(tournaments)")
+    for _seq, name, unique, _origin, partial in cur.fetchall():
+        if not unique or partial or name == ignore:
+            continue
+        cur.execute(f"PRAGMA index_info({name})")
+        if [row[2] for row in cur.fetchall()] == [column]:
+            return True
+    return False
+
+
+def ensure_schema(force: bool = False) -> None:
+    """Make sure the tournaments table and supporting indexes exist.
+
+    The DDL and column introspection only run once per database path in a
+    given process; pass ``force=True`` after dropping the table.
+    """
+
+    if not force and DB_PATH_STR in _SCHEMA_READY:
+        return
 
     DB_PATH.parent.mkdir(exist_ok=True)
-    con = sqlite3.connect(str(DB_PATH))
+    con = connect_db()
     cur = con.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS tournaments(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tournament_id TEXT,
-            name TEXT,
-            level TEXT,
-            category TEXT,
-            club_name TEXT,
-            city TEXT,
-            start_date TEXT,
-            end_date TEXT,
-            detail_url TEXT NOT NULL UNIQUE,
-            registration_url TEXT
-        );
-        """
-    )
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute(TABLE_DDL)
 
-    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_unique_detail_url ON tournaments(detail_url);")
-    cur.execute(
-        "CREATE INDEX IF NOT EXISTS idx_start_date ON tournaments(start_date)"
-    )
+    # A UNIQUE detail_url column already comes with SQLite's automatic index;
+    # only tables from older schemas need the explicit one for lookups.
+    if _has_unique_index(cur, "detail_url", ignore="idx_unique_detail_url"):
+        cur.execute("DROP INDEX IF EXISTS idx_unique_detail_url")
+    else:
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_unique_detail_url ON tournaments(detail_url);")
+    cur.execute(START_DATE_INDEX_DDL)
 
     # Ensure optional columns exist if the table was created with an older schema.
     cur.execute("PRAGMA table_info(tournaments)")
@@ -104,6 +180,7 @@ def ensure_schema() -> None:
 
     con.commit()
     con.close()
+    _SCHEMA_READY.add(DB_PATH_STR)
     log.debug("Schema ensured at %s", DB_PATH)
 
 
@@ -150,14 +227,24 @@ def _validate(item: Mapping[str, object]) -> Optional[str]:
     return None
 
 
+def _chunked(seq: List[str], size: int) -> Iterable[List[str]]:
+    for start in range(0, len(seq), size):
+        yield seq[start : start + size]
+
+
 def _row_to_dict(row: sqlite3.Row) -> Dict[str, object]:
     payload = {key: row[key] for key in row.keys()}
     payload["date"] = payload.get("start_date")
     return payload
 
 
-def import_items(items: Iterable[Mapping[str, object]]) -> ImportStats:
-    """Import tournaments and return statistics about the operation."""
+def import_items(items: Iterable[Mapping[str, object]], fresh: bool = False) -> ImportStats:
+    """Import tournaments and return statistics about the operation.
+
+    ``fresh=True`` is for a table that was just recreated and is empty: the
+    existing-row lookup is skipped and each detail_url is inserted once with
+    its merged values, giving the same rows as a regular import.
+    """
 
     ensure_schema()
     total = 0
@@ -185,56 +272,63 @@ def import_items(items: Iterable[Mapping[str, object]]) -> ImportStats:
         log.warning("No valid tournaments to import; database untouched")
         return ImportStats(total, 0, 0, 0, 0, _count_rows(), reasons)
 
-    con = sqlite3.connect(str(DB_PATH))
-    con.row_factory = sqlite3.Row
+    con = connect_db(bulk=fresh)
     cur = con.cursor()
 
     inserted = updated = skipped = 0
 
     try:
-        for item in valid:
-            detail_url = item["detail_url"]
+        # Take the write lock before diffing so a concurrent import cannot
+        # insert the same detail_url between the lookup and the writes.
+        cur.execute("BEGIN IMMEDIATE")
+        detail_urls = [] if fresh else list(dict.fromkeys(item["detail_url"] for item in valid))
+        existing: Dict[str, Dict[str, object]] = {}
+        for chunk in _chunked(detail_urls, MAX_SQL_PARAMS):
+            placeholders = ", ".join("?" * len(chunk))
             cur.execute(
-                "SELECT * FROM tournaments WHERE detail_url = ?",
-                (detail_url,),
+                f"SELECT {SELECT_COLUMNS} FROM tournaments WHERE detail_url IN ({placeholders})",
+                chunk,
             )
-            existing = cur.fetchone()
+            for row in cur.fetchall():
+                existing[row[DETAIL_URL_INDEX]] = dict(zip(DB_COLUMNS, row))
 
+        to_insert: List[tuple] = []
+        to_update: List[tuple] = []
+        for item in valid:
+            detail_url = item["detail_url"]
             values = tuple(item.get(col) for col in DB_COLUMNS)
+            current = existing.get(detail_url)
 
-            if existing is None:
-                cur.execute(
-                    """
-                    INSERT INTO tournaments(tournament_id, name, level, category, club_name, city,
-                                            start_date, end_date, detail_url, registration_url)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    values,
-                )
+            if current is None:
+                to_insert.append(values)
+                existing[detail_url] = dict(zip(DB_COLUMNS, values))
                 inserted += 1
                 continue
 
             updates: Dict[str, object] = {}
-            for idx, column in enumerate(DB_COLUMNS):
+            for column, new_value in zip(DB_COLUMNS, values):
                 if column == "detail_url":
                     continue
-                new_value = values[idx]
                 if new_value in (None, ""):
                     continue
-                if existing[column] != new_value:
+                if current[column] != new_value:
                     updates[column] = new_value
 
             if updates:
-                set_clause = ", ".join(f"{col} = ?" for col in updates)
-                parameters = tuple(updates[col] for col in updates) + (detail_url,)
-                cur.execute(
-                    f"UPDATE tournaments SET {set_clause} WHERE detail_url = ?",
-                    parameters,
-                )
+                current.update(updates)
+                if not fresh:
+                    to_update.append(tuple(current[col] for col in UPDATE_COLUMNS) + (detail_url,))
                 updated += 1
             else:
                 skipped += 1
 
+        if fresh:
+            to_insert = [tuple(row[col] for col in DB_COLUMNS) for row in existing.values()]
+        cur.executemany(INSERT_SQL, to_insert)
+        cur.executemany(UPDATE_SQL, to_update)
+        cur.execute("SELECT COUNT(*) FROM tournaments")
+        rows_after = int(cur.fetchone()[0])
+
         con.commit()
     except Exception as exc:  # pragma: no cover - defensive logging
         con.rollback()
@@ -243,7 +337,6 @@ def import_items(items: Iterable[Mapping[str, object]]) -> ImportStats:
     finally:
         con.close()
 
-    rows_after = _count_rows()
     log.info(
         "Import finished inserted=%s updated=%s skipped=%s db_rows_now=%s",
         inserted,
@@ -256,7 +349,7 @@ def import_items(items: Iterable[Mapping[str, object]]) -> ImportStats:
 
 
 def _count_rows() -> int:
-    con = sqlite3.connect(str(DB_PATH))
+    con = connect_db()
     cur = con.cursor()
     cur.execute("SELECT COUNT(*) FROM tournaments")
     rows = cur.fetchone()[0]
@@ -264,11 +357,25 @@ def _count_rows() -> int:
     return int(rows)
 
 
+def count_tournaments() -> tuple[int, int]:
+    """Return ``(total, with_start_date)`` for the tournaments table in one query."""
+
+    ensure_schema()
+    con = connect_db()
+    try:
+        total, dated = con.execute(
+            "SELECT COUNT(*), COUNT(NULLIF(start_date,'')) FROM tournaments"
+        ).fetchone()
+    finally:
+        con.close()
+    return int(total), int(dated)
+
+
 def fetch_all_tournaments(limit: Optional[int] = None) -> List[Dict[str, object]]:
     """Return tournaments ordered by start_date ascending (NULL/empty last)."""
 
     ensure_schema()
-    con = sqlite3.connect(str(DB_PATH))
+    con = connect_db()
     con.row_factory = sqlite3.Row
     cur = con.cursor()
 
@@ -290,15 +397,38 @@ def export_db_to_json(json_path: Path | None = None) -> Path:
     destination = json_path or JSON_PATH
     payload = fetch_all_tournaments()
     destination.parent.mkdir(parents=True, exist_ok=True)
-    destination.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    # Write next to the target and swap it in so readers never see a partial file.
+    # The temp name is unique per writer: concurrent exports each swap in a whole file.
+    tmp = destination.with_name(f"{destination.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(jsonio.dumps(payload))
+        os.replace(tmp, destination)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
     log.info("Exported %s tournaments to %s", len(payload), destination)
     return destination
 
 
+def export_if_changed(stats: ImportStats, json_path: Path | None = None) -> bool:
+    """Re-export the JSON only when ``stats`` reports writes or the file is missing."""
+
+    destination = json_path or JSON_PATH
+    if not (stats.inserted or stats.updated) and destination.exists():
+        log.info("No changes imported; keeping %s", destination)
+        return False
+    export_db_to_json(destination)
+    return True
+
+
 __all__ = [
     "ImportStats",
+    "SCHEMA_SQL",
+    "connect_db",
+    "count_tournaments",
     "ensure_schema",
     "export_db_to_json",
+    "export_if_changed",
     "fetch_all_tournaments",
     "import_items",
 ]
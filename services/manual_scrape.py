@@ -33,9 +33,7 @@ SEARCH_URL = "https://tenup.fft.fr/recherche/tournois"
 def normalize_item(it: dict) -> dict:
     """Ensure minimal default values for tournaments."""
 
-    it = dict(it)
-    it["name"] = (it.get("name") or it.get("title") or "Tournoi").strip()
-    return it
+    return it | {"name": (it.get("name") or it.get("title") or "Tournoi").strip()}
 
 
 def is_valid(it: dict) -> bool:
@@ -2,50 +2,414 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import functools
 import json
-import time
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List
-
-from playwright.sync_api import sync_playwright
+from queue import Queue
+from typing import Callable, Dict, Iterator, List, Tuple, TypeVar
+from urllib.parse import urljoin
 
 from scrapers.tenup import accept_cookies, navigate_to_results, select_discipline_padel
-from services.db_import import export_db_to_json, import_items
-from tenpadel.config_paths import JSON_PATH
+from services.db_import import export_if_changed, import_items
+from tenpadel.config_paths import SELECTOR_CACHE, STORAGE_STATE
+
+SEARCH_URL = "https://tenup.fft.fr/recherche/tournois"
+READY_SELECTOR = "form, article, [role='search'], button:has-text('ACCEPTER')"
+CARD_SELECTOR = "div.card-event, div[data-testid='event-card'], article"
+CARD_CANDIDATES = (
+    "div[data-testid='event-card']",
+    "article",
+    "li:has(div:has-text('DM'))",
+    "div.card, div.card-event",
+    "div:has(> div:has-text('DM'))",
+)
+# Read every card's text and first heading in one round-trip to the page.
+CARD_READER_JS = """els => els.map(e => {
+    const h = e.querySelector("h1, h2, h3, h4, h5, h6, [role='heading']");
+    return {text: e.innerText || "", heading: h ? h.innerText : null};
+})"""
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "stylesheet", "font", "media", "texttrack"})
+BLOCKED_HOSTS = ("googletagmanager", "google-analytics", "doubleclick", "hotjar")
+LEVEL_PATTERN = r"\bP(100|250|500|1000|1500|2000)\b"
+CATEGORY_PATTERN = r"\bDM(?:\s*/\s*DX)?|\bSM\s*/\s*SD|\bDX\b"
+DATE_PATTERN = r"\d{1,2}\s+[a-zéû\.]+\.?\s+\d{4}"
+_LEVEL_RE = re.compile(LEVEL_PATTERN)
+_CAT_RE = re.compile(CATEGORY_PATTERN, re.I)
+_DATE_RE = re.compile(DATE_PATTERN)
+_FR_DATE_RE = re.compile(r"(\d{1,2})\s+([a-zéû\.]+)\s+(\d{4})")
+ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+FR_MONTHS = {
+    "janv": 1,
+    "jan.": 1,
+    "févr": 2,
+    "fév.": 2,
+    "mars": 3,
+    "avr": 4,
+    "avr.": 4,
+    "mai": 5,
+    "juin": 6,
+    "juil": 7,
+    "juil.": 7,
+    "août": 8,
+    "sept": 9,
+    "sep.": 9,
+    "oct": 10,
+    "oct.": 10,
+    "nov": 11,
+    "déc": 12,
+    "déc.": 12,
+}
+_SLUG_SEP = re.compile(r"\W+")
+
+T = TypeVar("T")
+
+# Sync Playwright objects are bound to the thread that created them, so the
+# shared browser lives on one dedicated daemon thread and every scrape is
+# dispatched there. This lets Flask/APScheduler threads reuse the same
+# Chromium instead of paying the launch cost on each call.
+_PW_SINGLETON: tuple | None = None  # (playwright, browser)
+_PW_LOCK = threading.Lock()
+_PW_QUEUE: Queue = Queue()
+_PW_THREAD: threading.Thread | None = None
+_PW_BUSY = threading.Event()
+# Longest a shutdown step (session close, atexit) waits for the worker. A
+# scrape still running past it is left to die with the daemon thread.
+PW_SHUTDOWN_TIMEOUT = 10.0
+
+
+def _pw_worker() -> None:
+    while True:
+        fn, args, future = _PW_QUEUE.get()
+        if not future.set_running_or_notify_cancel():
+            continue
+        _PW_BUSY.set()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            _PW_BUSY.clear()
+
+
+def _run_on_pw_thread(fn: Callable[..., T], *args, timeout: float | None = None) -> T:
+    """Run ``fn`` on the thread owning the shared Playwright instance.
+
+    With ``timeout``, raise ``FutureTimeout`` once it elapses; the job stays
+    queued and still runs when the worker gets to it.
+    """
+
+    global _PW_THREAD
+    with _PW_LOCK:
+        if _PW_THREAD is None:
+            _PW_THREAD = threading.Thread(target=_pw_worker, name="playwright", daemon=True)
+            _PW_THREAD.start()
+    if threading.current_thread() is _PW_THREAD:
+        return fn(*args)
+    future: Future = Future()
+    _PW_QUEUE.put((fn, args, future))
+    return future.result(timeout)
+
+
+def _get_browser():
+    """Return the shared Chromium browser, launching it on first use."""
+
+    global _PW_SINGLETON
+    with _PW_LOCK:
+        if _PW_SINGLETON is not None:
+            playwright, browser = _PW_SINGLETON
+            if browser.is_connected():
+                return browser
+            playwright.stop()
+            _PW_SINGLETON = None
+        from playwright.sync_api import sync_playwright
+
+        playwright = sync_playwright().start()
+        browser = playwright.chromium.launch(headless=True)
+        _PW_SINGLETON = (playwright, browser)
+        return browser
+
+
+def _close_playwright() -> None:
+    global _PW_SINGLETON
+    with _PW_LOCK:
+        if _PW_SINGLETON is None:
+            return
+        playwright, browser = _PW_SINGLETON
+        _PW_SINGLETON = None
+    try:
+        browser.close()
+    finally:
+        playwright.stop()
 
 
+def close_playwright() -> None:
+    """Shut down the shared browser (called automatically at exit)."""
 
-def _extract_cards(page, limit=500, debug=False):
-    import os
-    import re
+    if _PW_SINGLETON is None or _PW_BUSY.is_set():
+        # A scrape still holds the worker: queuing behind it could block exit forever.
+        return
+    try:
+        _run_on_pw_thread(_close_playwright, timeout=PW_SHUTDOWN_TIMEOUT)
+    except FutureTimeout:
+        pass
+
+
+atexit.register(close_playwright)
+
+
+def _scroll_until_stable(page, selector: str, limit: int, max_iters: int = 24, quiet_ms: int = 300) -> int:
+    """Scroll until the card count stops growing or reaches ``limit``.
+
+    Each scroll waits at most ``quiet_ms`` for new cards to appear, then
+    re-reads the count so cards landing just after the wait still count as
+    progress. Two readings in a row without new cards end the loop.
+    """
+
+    count = page.locator(selector).count()
+    stable = 0
+    for _ in range(max_iters):
+        if count >= limit:
+            break
+        page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
+        try:
+            page.wait_for_function(
+                "([sel, prev]) => document.querySelectorAll(sel).length > prev",
+                arg=[selector, count],
+                timeout=quiet_ms,
+            )
+        except Exception:
+            pass
+        current = page.locator(selector).count()
+        if current > count:
+            count, stable = current, 0
+            continue
+        stable += 1
+        if stable >= 2:
+            break
+    return count
+
+
+def _slugify(value: str) -> str:
+    """Collapse every non-word run into a dash and lower-case the result."""
 
-    items = []
+    return _SLUG_SEP.sub("-", value).strip("-").lower()
+
+
+API_FIELDS = {
+    "name": ("libelle", "nom", "name", "title"),
+    "start_date": ("dateDebut", "startDate", "date_debut", "start_date"),
+    "end_date": ("dateFin", "endDate", "date_fin", "end_date"),
+    "club_name": ("nomClub", "clubName", "club_name", "club"),
+    "city": ("ville", "commune", "city"),
+    "detail_url": ("url", "detailUrl", "detail_url"),
+}
+
+
+def _is_api_response(response) -> bool:
+    request = response.request
+    return (
+        request.resource_type in ("xhr", "fetch")
+        and "tournoi" in request.url.lower()
+        and "json" in (response.headers.get("content-type") or "")
+    )
+
+
+def _api_field(record: Dict, field: str):
+    for key in API_FIELDS[field]:
+        value = record.get(key)
+        if isinstance(value, dict):
+            value = value.get("nom") or value.get("name") or value.get("date")
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _api_date(value) -> str | None:
+    text = str(value or "")[:10]
+    return text if ISO_DATE.match(text) else None
+
+
+def _iter_api_records(node):
+    """Yield every dict in a JSON payload that looks like a tournament."""
+
+    if isinstance(node, list):
+        for child in node:
+            yield from _iter_api_records(child)
+    elif isinstance(node, dict):
+        if _api_field(node, "name") and _api_date(_api_field(node, "start_date")):
+            yield node
+        else:
+            for child in node.values():
+                yield from _iter_api_records(child)
+
+
+def _api_url(value, base_url: str) -> str | None:
+    """Resolve a detail link from the API against ``base_url``; http(s) only."""
+
+    if value in (None, ""):
+        return None
+    url = urljoin(base_url, str(value))
+    return url if url.startswith(("http://", "https://")) else None
+
+
+def _parse_api_payload(payloads: List, limit: int, base_url: str = SEARCH_URL) -> List[Dict]:
+    """Build tournament items from JSON captured on the TenUp search XHRs.
+
+    Relative detail links are resolved against ``base_url``, the page that
+    issued the requests.
+    """
+
+    items: Dict[str, Dict] = {}
+    for payload in payloads:
+        for record in _iter_api_records(payload):
+            if len(items) >= limit:
+                return list(items.values())
+            name = str(_api_field(record, "name")).strip()
+            s_iso = _api_date(_api_field(record, "start_date"))
+            e_iso = _api_date(_api_field(record, "end_date")) or s_iso
+            m_level = _LEVEL_RE.search(name)
+            m_cat = _CAT_RE.search(name)
+            tid = _slugify(f"{name}-{s_iso}-{e_iso}")
+            items.setdefault(
+                tid,
+                {
+                    "tournament_id": tid,
+                    "name": name,
+                    "level": m_level.group(0) if m_level else None,
+                    "category": m_cat.group(0).upper().replace(" ", "") if m_cat else None,
+                    "club_name": _api_field(record, "club_name"),
+                    "city": _api_field(record, "city"),
+                    "start_date": s_iso,
+                    "end_date": e_iso,
+                    "detail_url": _api_url(_api_field(record, "detail_url"), base_url),
+                    "registration_url": None,
+                },
+            )
+    return list(items.values())
+
+
+@functools.lru_cache(maxsize=1024)
+def _fr_to_iso(s: str) -> str | None:
+    """Convert an already lower-cased French date such as '12 oct. 2025'."""
+
+    m = _FR_DATE_RE.search(s)
+    if not m:
+        return None
+    d, mo, y = int(m.group(1)), FR_MONTHS.get(m.group(2)), int(m.group(3))
+    return f"{y:04d}-{mo:02d}-{d:02d}" if mo else None
+
+
+@functools.lru_cache(maxsize=None)
+def _polars():
+    """Import polars once; a missing module is remembered instead of re-searched."""
+
+    try:
+        import polars
+    except ImportError:
+        return None
+    return polars
+
+
+def _extract_fields(texts: List[str]) -> Tuple[list, list, list]:
+    """Extract level, category and raw date tokens for every card text.
+
+    Runs the regexes column-wise through polars when it is installed and
+    falls back to a per-row ``re`` loop otherwise.
+    """
+
+    pl = _polars()
+    if pl is not None and texts:
+        series = pl.Series(texts, dtype=pl.Utf8)
+        return (
+            series.str.extract(LEVEL_PATTERN, group_index=0).to_list(),
+            series.str.extract(f"(?i)({CATEGORY_PATTERN})", group_index=1).to_list(),
+            series.str.to_lowercase().str.extract_all(DATE_PATTERN).to_list(),
+        )
+
+    levels, categories, date_lists = [], [], []
+    for txt in texts:
+        m_level = _LEVEL_RE.search(txt)
+        levels.append(m_level.group(0) if m_level else None)
+        m_cat = _CAT_RE.search(txt)
+        categories.append(m_cat.group(0) if m_cat else None)
+        date_lists.append(_DATE_RE.findall(txt.lower()))
+    return levels, categories, date_lists
+
+
+def _cached_selector() -> tuple[str, int] | None:
+    """Return the cached ``(selector, card count)``, if it names a known candidate."""
+
+    try:
+        cache = json.loads(SELECTOR_CACHE.read_text(encoding="utf-8"))
+        selector, count = cache.get("best_selector"), int(cache.get("count", 0))
+    except (OSError, ValueError, TypeError, AttributeError):
+        return None
+    return (selector, count) if selector in CARD_CANDIDATES else None
+
+
+def _store_selector(selector: str, count: int) -> None:
+    """Remember the winning selector and its card count (temp file + os.replace)."""
+
+    tmp = SELECTOR_CACHE.with_name(f"{SELECTOR_CACHE.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        SELECTOR_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps({"best_selector": selector, "count": count}), encoding="utf-8")
+        os.replace(tmp, SELECTOR_CACHE)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def _extract_cards(page, limit=500, debug=False):
+    items: dict[str, dict] = {}
+    seen: set[str] = set()
 
     try:
         page.wait_for_selector("text=RÉSULTATS", timeout=10000)
     except Exception:
         pass
 
-    candidates = [
-        "div[data-testid='event-card']",
-        "article",
-        "li:has(div:has-text('DM'))",
-        "div.card, div.card-event",
-        "div:has(> div:has-text('DM'))",
-    ]
-
-    best = []
-    best_count = -1
-    for sel in candidates:
+    best_sel = None
+    best_count = 0
+    cached = _cached_selector()
+    if cached:
+        cached_sel, cached_count = cached
         try:
-            loc = page.locator(sel)
-            cnt = loc.count()
+            best_count = page.locator(cached_sel).count()
+        except Exception:
+            best_count = 0
+        if debug:
+            print(f"[DEBUG] Sélecteur en cache '{cached_sel}' -> {best_count} éléments (mémorisé: {cached_count})")
+        # Clearly fewer cards than when it won (or none): probe every candidate again.
+        if best_count and best_count * 2 >= cached_count:
+            best_sel = cached_sel
+            if best_count > cached_count:
+                _store_selector(best_sel, best_count)
+        else:
+            best_count = 0
+
+    if best_sel is None:
+        for sel in CARD_CANDIDATES:
+            try:
+                cnt = page.locator(sel).count()
+            except Exception:
+                continue
             if debug:
                 print(f"[DEBUG] Sélecteur '{sel}' -> {cnt} éléments")
             if cnt > best_count:
-                best, best_count = loc.all(), cnt
-        except Exception:
-            continue
+                best_sel, best_count = sel, cnt
+        if best_sel is not None:
+            _store_selector(best_sel, best_count)
+    try:
+        best = page.locator(best_sel).evaluate_all(CARD_READER_JS) if best_sel else []
+    except Exception:
+        best = []
     if debug:
         print(f"[DEBUG] Total cartes retenues: {len(best)}")
 
@@ -58,87 +422,60 @@ def _extract_cards(page, limit=500, debug=False):
             print("[DEBUG] 0 carte — dump écrit: data/last_page.html / data/last_page.png")
         return []
 
-    FR_MONTHS = {
-        "janv": 1,
-        "jan.": 1,
-        "févr": 2,
-        "fév.": 2,
-        "mars": 3,
-        "avr": 4,
-        "avr.": 4,
-        "mai": 5,
-        "juin": 6,
-        "juil": 7,
-        "juil.": 7,
-        "août": 8,
-        "sept": 9,
-        "sep.": 9,
-        "oct": 10,
-        "oct.": 10,
-        "nov": 11,
-        "déc": 12,
-        "déc.": 12,
-    }
-
-    def fr_to_iso(s: str) -> str | None:
-        m = re.search(r"(\d{1,2})\s+([a-zéû\.]+)\s+(\d{4})", s.lower())
-        if not m:
-            return None
-        d, mo, y = int(m.group(1)), FR_MONTHS.get(m.group(2)), int(m.group(3))
-        return f"{y:04d}-{mo:02d}-{d:02d}" if mo else None
-
-    for c in best[:limit]:
+    cards: List[Tuple[str, str | None]] = []
+    for card in best:
+        if len(cards) >= limit:
+            break
+        txt = card["text"]
+        if txt in seen:
+            continue
+        seen.add(txt)
+        heading = card["heading"]
+        cards.append((txt, heading.strip() if heading is not None else None))
+
+    levels, categories, date_lists = _extract_fields([txt for txt, _ in cards])
+
+    for (txt, heading), level, category, dates in zip(cards, levels, categories, date_lists):
         try:
-            txt = c.inner_text()
-            name = (
-                c.get_by_role("heading").first.inner_text().strip()
-                if c.get_by_role("heading").count()
-                else (txt.splitlines()[0].strip() if txt else "Tournoi")
-            )
-            dates = re.findall(r"\d{1,2}\s+[a-zéû\.]+\.?\s+\d{4}", txt.lower())
-            s_iso = fr_to_iso(dates[0]) if dates else None
-            e_iso = fr_to_iso(dates[1]) if len(dates) > 1 else s_iso
-            m_level = re.search(r"\bP(100|250|500|1000|1500|2000)\b", txt)
-            level = m_level.group(0) if m_level else None
-            m_cat = re.search(r"\bDM(?:\s*/\s*DX)?|\bSM\s*/\s*SD|\bDX\b", txt, re.I)
-            category = m_cat.group(0).upper().replace(" ", "") if m_cat else None
+            lines = txt.splitlines()
+            if heading is not None:
+                name = heading
+            else:
+                name = next((l.strip() for l in lines if l.strip()), "Tournoi")
+            s_iso = _fr_to_iso(dates[0]) if dates else None
+            e_iso = _fr_to_iso(dates[1]) if len(dates) > 1 else s_iso
+            category = category.upper().replace(" ", "") if category else None
             club = city = None
-            loc_line = next((l for l in txt.splitlines() if "," in l), "")
+            loc_line = next((l for l in lines if "," in l), "")
             if loc_line:
-                parts = [p.strip() for p in loc_line.split(",")]
-                club = ", ".join(parts[:-1]) if len(parts) > 1 else parts[0]
-                city = parts[-1] if len(parts) > 1 else None
-            import re as _re
-
-            tid = _re.sub(r"\W+", "-", f"{name}-{s_iso}-{e_iso}").strip("-").lower()
-            items.append(
-                {
-                    "tournament_id": tid,
-                    "name": name,
-                    "level": level,
-                    "category": category,
-                    "club_name": club,
-                    "city": city,
-                    "start_date": s_iso,
-                    "end_date": e_iso,
-                    "detail_url": None,
-                    "registration_url": None,
-                }
-            )
+                club, _, city = loc_line.rpartition(",")
+                club, city = club.strip(), city.strip()
+            tid = _slugify(f"{name}-{s_iso}-{e_iso}")
+            if tid in items:
+                continue
+            items[tid] = {
+                "tournament_id": tid,
+                "name": name,
+                "level": level,
+                "category": category,
+                "club_name": club,
+                "city": city,
+                "start_date": s_iso,
+                "end_date": e_iso,
+                "detail_url": None,
+                "registration_url": None,
+            }
         except Exception:
             continue
     if debug:
         print(f"[DEBUG] Items extraits: {len(items)}")
-    return items
+    return list(items.values())
 
 
 
 def _save_results(items: List[Dict]) -> None:
-    JSON_PATH.parent.mkdir(parents=True, exist_ok=True)
-    JSON_PATH.write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
-
     stats = import_items(items)
-    export_db_to_json()
+    export_if_changed(stats)
     print(
         "Import:"
         f" inserted={stats.inserted} updated={stats.updated} skipped={stats.skipped}"
@@ -146,43 +483,182 @@ def _save_results(items: List[Dict]) -> None:
     )
 
 
-def scrape_all(
-    date_from: str | None = None,
-    date_to: str | None = None,
-    limit: int = 500,
-    debug: bool = False,
-) -> List[Dict]:
-    """Scrape TenUp tournaments, filter/sort client-side and persist results."""
+def _block_heavy_requests(route) -> None:
+    """Abort images/CSS/fonts/media and analytics calls; the scraper only reads text."""
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(locale="fr-FR", viewport={"width": 1440, "height": 900})
-        page.goto("https://tenup.fft.fr/recherche/tournois", wait_until="networkidle")
-        accept_cookies(page)
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        host in request.url for host in BLOCKED_HOSTS
+    ):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _storage_state() -> str | None:
+    """Return the saved TenUp session (consent cookies) if one was persisted."""
+
+    try:
+        return str(STORAGE_STATE) if STORAGE_STATE.stat().st_size else None
+    except OSError:
+        return None
+
+
+def _new_context(browser):
+    options = {"locale": "fr-FR", "viewport": {"width": 1440, "height": 900}}
+    state = _storage_state()
+    try:
+        context = browser.new_context(storage_state=state, **options)
+    except Exception:
+        if state is None:
+            raise
+        context = browser.new_context(**options)
+    context.route("**/*", _block_heavy_requests)
+    return context
+
+
+def _collect(context, url: str, limit: int, debug: bool) -> List[Dict]:
+    """Run the search/scroll/extract pipeline on a fresh page of ``context``."""
+
+    # Before any navigation, cookies can only come from the loaded storage state
+    # (or an earlier scrape on this context). Without them, always accept: the
+    # banner is injected late and an instant probe can miss it.
+    cold = not context.cookies()
+    page = context.new_page()
+    try:
+        responses: List = []
+        page.on("response", lambda r: responses.append(r) if _is_api_response(r) else None)
+        page.goto(url, wait_until="domcontentloaded")
+        try:
+            page.wait_for_selector(READY_SELECTOR, timeout=10000)
+        except Exception:
+            pass
+        if cold:
+            accept_cookies(page)
         select_discipline_padel(page)
+        if cold:
+            try:
+                STORAGE_STATE.parent.mkdir(parents=True, exist_ok=True)
+                context.storage_state(path=str(STORAGE_STATE))
+            except Exception:
+                pass
         navigate_to_results(page)
 
-        last = -1
-        for _ in range(16):
-            page.mouse.wheel(0, 2400)
-            time.sleep(0.5)
-            count = page.locator("body *").count()
-            if count == last:
-                break
-            last = count
+        payloads: List = []
+
+        def api_items() -> List[Dict]:
+            while responses:
+                try:
+                    payloads.append(responses.pop(0).json())
+                except Exception:
+                    continue
+            return _parse_api_payload(payloads, limit, page.url)
+
+        items = api_items()
+        if len(items) < limit:
+            _scroll_until_stable(page, CARD_SELECTOR, limit)
+            items = api_items()
+        if items:
+            if debug:
+                print(f"[DEBUG] {len(items)} tournois lus depuis l'API JSON")
+            return items
+        return _extract_cards(page, limit=limit, debug=debug)
+    finally:
+        # Shared contexts (tenup_session) outlive the call: drop the page and its listener.
+        page.close()
+
+
+def _scrape_items(limit: int, debug: bool, session=None) -> List[Dict]:
+    if session is not None:
+        return _collect(session, SEARCH_URL, limit, debug)
+    context = _new_context(_get_browser())
+    try:
+        return _collect(context, SEARCH_URL, limit, debug)
+    finally:
+        context.close()
+
+
+@contextmanager
+def tenup_session() -> Iterator:
+    """Open a browser context that several ``scrape_all`` calls can share.
+
+    The context lives on the shared Playwright thread, so cookies, consent
+    and cache carry over between scrapes until the block exits.
+    """
+
+    context = _run_on_pw_thread(lambda: _new_context(_get_browser()))
+    try:
+        yield context
+    finally:
+        try:
+            _run_on_pw_thread(context.close, timeout=PW_SHUTDOWN_TIMEOUT)
+        except FutureTimeout:
+            pass
+
+
+def _scrape_scopes(scopes: List[Tuple[str, str]], limit: int, debug: bool) -> List[Dict]:
+    """Scrape ``scopes`` one after another on a browser private to this thread."""
+
+    from playwright.sync_api import sync_playwright
+
+    items: List[Dict] = []
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        try:
+            for label, url in scopes:
+                context = _new_context(browser)
+                try:
+                    found = _collect(context, url, limit, debug)
+                finally:
+                    context.close()
+                if debug:
+                    print(f"[DEBUG] {label}: {len(found)} tournois")
+                items.extend(found)
+        finally:
+            browser.close()
+    return items
+
+
+def _bound(value: str | None) -> str | None:
+    if not value:
+        return None
+    if not ISO_DATE.match(value):
+        raise ValueError(f"Date invalide (attendu YYYY-MM-DD): {value!r}")
+    return value
 
-        items = _extract_cards(page, limit=limit, debug=debug)
-        browser.close()
 
-    def to_dt(value: str | None) -> datetime | None:
-        return datetime.strptime(value, "%Y-%m-%d") if value else None
+def _in_range(item: Dict, lower: str | None, upper: str | None) -> bool:
+    # Dates are zero-padded ISO strings, so string order is date order.
+    if lower is not None:
+        start = item["start_date"]
+        if not start or start < lower:
+            return False
+    if upper is not None:
+        end = item["end_date"]
+        if not end or end > upper:
+            return False
+    return True
 
-    if date_from:
-        lower = to_dt(date_from)
-        items = [item for item in items if item["start_date"] and to_dt(item["start_date"]) >= lower]
-    if date_to:
-        upper = to_dt(date_to)
-        items = [item for item in items if item["end_date"] and to_dt(item["end_date"]) <= upper]
+
+Window = Tuple[str | None, str | None]
+
+
+def _dedupe_by_id(items: List[Dict], debug: bool = False) -> List[Dict]:
+    """Keep the first item per ``tournament_id`` so the import never sees repeats."""
+
+    by_id: Dict[str, Dict] = {}
+    for item in items:
+        by_id.setdefault(item["tournament_id"], item)
+    if debug and len(by_id) != len(items):
+        print(f"[DEBUG] Doublons ignorés: {len(items) - len(by_id)}")
+    return list(by_id.values())
+
+
+def _finalise(items: List[Dict], windows: List[Window], debug: bool = False) -> List[Dict]:
+    items = _dedupe_by_id(items, debug)
+    bounds = [(_bound(lower), _bound(upper)) for lower, upper in windows]
+    if bounds and all(lower is not None or upper is not None for lower, upper in bounds):
+        items = [item for item in items if any(_in_range(item, lo, hi) for lo, hi in bounds)]
 
     items.sort(key=lambda x: (x["start_date"] or "9999-99-99"))
     _save_results(items)
@@ -190,6 +666,67 @@ def scrape_all(
     return items
 
 
+def scrape_all(
+    date_from: str | None = None,
+    date_to: str | None = None,
+    limit: int = 500,
+    debug: bool = False,
+    session=None,
+) -> List[Dict]:
+    """Scrape TenUp tournaments, filter/sort client-side and persist results.
+
+    Pass a context from :func:`tenup_session` to reuse it across calls;
+    otherwise a temporary context is opened on the shared browser.
+    """
+
+    items = _run_on_pw_thread(_scrape_items, limit, debug, session)
+    return _finalise(items, [(date_from, date_to)], debug)
+
+
+def scrape_many(
+    scopes: List[Tuple[str, str]],
+    concurrency: int = 4,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    limit: int = 500,
+    debug: bool = False,
+) -> List[Dict]:
+    """Scrape several ``(label, search_url)`` scopes in parallel and persist the union.
+
+    Each scope is typically a TenUp search URL pre-filtered on one ligue or
+    comité. Scopes are spread over ``concurrency`` worker threads; each worker
+    owns one browser and opens a fresh context per scope. Results are merged
+    by ``tournament_id``.
+    """
+
+    if not scopes:
+        return []
+    workers = max(1, min(concurrency, len(scopes)))
+    buckets = [scopes[i::workers] for i in range(workers)]
+    items: List[Dict] = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tenup-scope") as pool:
+        for batch in pool.map(lambda bucket: _scrape_scopes(bucket, limit, debug), buckets):
+            items.extend(batch)
+    return _finalise(items, [(date_from, date_to)], debug)
+
+
+def scrape_windows(
+    windows: List[Window],
+    limit: int = 500,
+    debug: bool = False,
+    session=None,
+) -> List[Dict]:
+    """Scrape once and persist the tournaments falling in any of ``windows``.
+
+    The TenUp listing is filtered client-side, so every ``(date_from,
+    date_to)`` window is served from the same scrape instead of one browser
+    run per window. A tournament matching several windows is kept once.
+    """
+
+    items = _run_on_pw_thread(_scrape_items, limit, debug, session)
+    return _finalise(items, windows, debug)
+
+
 # --- compatibilité legacy pour app.py
 
 def scrape_tenup(**kwargs):
@@ -198,10 +735,37 @@ def scrape_tenup(**kwargs):
     return scrape_all(**kwargs)
 
 
+def _cli_date(value: str) -> str:
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date invalide (attendu YYYY-MM-DD): {value!r}")
+    return value
+
+
+def _cli_window(value: str) -> Window:
+    date_from, sep, date_to = value.partition(":")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"fenêtre invalide (attendu FROM:TO): {value!r}")
+    return (
+        _cli_date(date_from) if date_from else None,
+        _cli_date(date_to) if date_to else None,
+    )
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Scrape TenUp tournaments (UI only)")
-    parser.add_argument("--date-from", dest="date_from")
-    parser.add_argument("--date-to", dest="date_to")
+    parser.add_argument("--date-from", dest="date_from", type=_cli_date)
+    parser.add_argument("--date-to", dest="date_to", type=_cli_date)
+    parser.add_argument(
+        "--window",
+        dest="windows",
+        action="append",
+        type=_cli_window,
+        default=[],
+        metavar="FROM:TO",
+        help="fenêtre de dates YYYY-MM-DD:YYYY-MM-DD (répétable, bornes optionnelles)",
+    )
     parser.add_argument("--limit", type=int, default=500)
     parser.add_argument("--debug", action="store_true")
     return parser
@@ -210,12 +774,13 @@ def _build_parser() -> argparse.ArgumentParser:
 def main(argv: list[str] | None = None) -> int:
     parser = _build_parser()
     args = parser.parse_args(argv)
-    results = scrape_all(
-        date_from=args.date_from,
-        date_to=args.date_to,
-        limit=args.limit,
-        debug=args.debug,
-    )
+    windows = list(args.windows)
+    if args.date_from or args.date_to or not windows:
+        windows.append((args.date_from, args.date_to))
+    # One-shot run: drive Playwright from this thread so Ctrl-C interrupts it
+    # directly instead of waiting on the shared worker.
+    items = _scrape_scopes([("TenUp", SEARCH_URL)], args.limit, args.debug)
+    results = _finalise(items, windows, args.debug)
     print(f"🎯 TenUp scraping terminé – {len(results)} tournois")
     print("   → Export JSON : data/tournaments.json")
     print("   → Base SQLite: data/app.db")
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, Mapping
 
-from services.db_import import export_db_to_json, import_items
+from services.db_import import export_db_to_json, export_if_changed, import_items
 
 
 @dataclass(slots=True)
@@ -31,7 +31,7 @@ class TournamentStore:
 
     def upsert_many(self, records: Iterable[Mapping[str, object]]) -> UpsertResult:
         stats = import_items(records)
-        self._export_json()
+        export_if_changed(stats, self._json_path)
         return UpsertResult(
             inserted=stats.inserted,
             updated=stats.updated,
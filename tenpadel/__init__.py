@@ -1,3 +1,3 @@
 """Shared project utilities for TenPadel."""
 
-__all__ = ["config_paths"]
+__all__ = ["config_paths", "jsonio"]
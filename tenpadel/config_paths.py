@@ -1,12 +1,31 @@
 """Centralised filesystem paths for the TenPadel project."""
 from __future__ import annotations
 
+import os
 from pathlib import Path
+from typing import Final
 
 ROOT = Path(__file__).resolve().parent.parent
 DATA = ROOT / "data"
 DB_PATH = DATA / "app.db"
 JSON_PATH = DATA / "tournaments.json"
 LOG_DIR = DATA / "logs"
+# Playwright session (TenUp cookies): runtime-only, kept out of git.
+STORAGE_STATE = DATA / "browser" / "storage_state.json"
+SELECTOR_CACHE = DATA / "selector_cache.json"
 
-__all__ = ["ROOT", "DATA", "DB_PATH", "JSON_PATH", "LOG_DIR"]
+# String forms for APIs such as sqlite3.connect that take a filesystem path.
+DB_PATH_STR: Final[str] = os.fspath(DB_PATH)
+JSON_PATH_STR: Final[str] = os.fspath(JSON_PATH)
+
+__all__ = [
+    "ROOT",
+    "DATA",
+    "DB_PATH",
+    "DB_PATH_STR",
+    "JSON_PATH",
+    "JSON_PATH_STR",
+    "LOG_DIR",
+    "STORAGE_STATE",
+    "SELECTOR_CACHE",
+]
@@ -0,0 +1,29 @@
+"""JSON serialisation helpers preferring ``orjson`` when it is installed."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialise ``obj`` to indented UTF-8 JSON bytes."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from UTF-8 bytes (or ``str``)."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+__all__ = ["dumps", "loads"]
@@ -1,8 +1,12 @@
 # tools/healthcheck.py
-import json, sqlite3, time, re, urllib.request, sys
+import sqlite3, time, re, http.client, sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 from datetime import datetime
+from pathlib import Path
 
-from tenpadel.config_paths import DB_PATH as DB, JSON_PATH as JSONF, LOG_DIR as LOGD
+from tenpadel import jsonio
+from tenpadel.config_paths import DB_PATH as DB, DB_PATH_STR as DB_STR, JSON_PATH as JSONF, JSON_PATH_STR as JSON_STR, LOG_DIR as LOGD
 
 API  = "http://127.0.0.1:5000/api/tournaments"
 
@@ -16,36 +20,34 @@ def out_lines(lines):
     LOGD.mkdir(parents=True, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d-%H%M%S")
     rpt = LOGD / f"health-{ts}.txt"
-    rpt.write_text("\n".join(lines), encoding="utf-8")
+    with open(rpt, "w", encoding="utf-8", buffering=1 << 16) as f:
+        f.writelines(l + "\n" for l in lines)
     print(f"\n📄 Rapport: {rpt}")
     return rpt
 
-def main():
+def _check_files():
+    lines = [
+        "\n[FILES]",
+        f"json: {JSONF}  exists={JSONF.exists()}  mtime={stamp(JSONF)}",
+        f"db:   {DB}     exists={DB.exists()}     mtime={stamp(DB)}",
+    ]
+    return True, lines, {}
+
+def _check_json():
     ok = True
     L  = []
-    L.append("=== TenPadel Healthcheck ===")
-
-    # 1) FICHIERS
-    L.append("\n[FILES]")
-    L.append(f"json: {JSONF}  exists={JSONF.exists()}  mtime={stamp(JSONF)}")
-    L.append(f"db:   {DB}     exists={DB.exists()}     mtime={stamp(DB)}")
-
-    # 2) JSON
     json_count = dated_json = 0
     first_date = last_date = None
     if JSONF.exists():
         try:
-            data = json.loads(JSONF.read_text(encoding="utf-8"))
+            with open(JSON_STR, "rb") as fh:
+                data = jsonio.loads(fh.read())
             items = data.get("tournaments", [])
             json_count = len(items)
-            for t in items:
-                d = (t.get("start_date") or t.get("date") or "").strip() or None
-                if d:
-                    dated_json += 1
-                    if not first_date or d < first_date:
-                        first_date = d
-                    if not last_date or d > last_date:
-                        last_date = d
+            dates = [d for t in items if (d := (t.get("start_date") or t.get("date") or "").strip())]
+            dated_json = len(dates)
+            first_date = min(dates, default=None)
+            last_date = max(dates, default=None)
             L.append(f"[JSON] tournaments={json_count}  with_start_date={dated_json}  range={first_date}..{last_date}")
             if json_count == 0:
                 ok = False
@@ -55,24 +57,27 @@ def main():
             L.append(f"!! JSON illisible: {e}")
     else:
         L.append(".. JSON manquant (ok si on ne l'utilise pas)")
+    return ok, L, {"json_count": json_count, "dated_json": dated_json}
 
-    # 3) DB
+def _check_db():
+    ok = True
+    L  = []
     db_total = db_dated = 0
     if DB.exists():
         try:
-            con = sqlite3.connect(str(DB))
+            con = sqlite3.connect(DB_STR)
             cur = con.cursor()
             cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='tournaments'")
             if not cur.fetchone():
                 ok = False
                 L.append("!! Table 'tournaments' absente")
             else:
-                cur.execute("SELECT COUNT(*) FROM tournaments")
-                db_total = cur.fetchone()[0]
-                cur.execute("SELECT COUNT(*) FROM tournaments WHERE COALESCE(start_date,'')!=''")
-                db_dated = cur.fetchone()[0]
-                cur.execute("SELECT MIN(start_date), MAX(start_date) FROM tournaments WHERE COALESCE(start_date,'')!=''")
-                db_min, db_max = cur.fetchone()
+                # un seul passage: total, datés et bornes (NULLIF écarte les dates vides)
+                cur.execute(
+                    "SELECT COUNT(*), COUNT(NULLIF(start_date,'')),"
+                    " MIN(NULLIF(start_date,'')), MAX(NULLIF(start_date,'')) FROM tournaments"
+                )
+                db_total, db_dated, db_min, db_max = cur.fetchone()
                 L.append(f"[DB] rows={db_total}  with_start_date={db_dated}  range={db_min}..{db_max}")
                 if db_total == 0:
                     ok = False
@@ -84,18 +89,56 @@ def main():
                 pass
     else:
         L.append(".. DB manquante -> import non exécuté")
+    return ok, L, {"db_total": db_total, "db_dated": db_dated}
 
-    # 4) API
+def _check_api():
+    ok = True
+    L  = []
     api_count = 0
+    url = urlsplit(API)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=5)
     try:
-        with urllib.request.urlopen(API, timeout=5) as r:
-            body = r.read().decode("utf-8", errors="ignore")
-            # comptage simple
-            api_count = body.count('"detail_url"')
-            L.append(f"[API] /api/tournaments -> ~{api_count} objets")
+        # HEAD: même route que le front, mais seul X-Total-Count est transféré
+        conn.request("HEAD", url.path)
+        r = conn.getresponse()
+        r.read()
+        total = r.getheader("X-Total-Count")
+        if r.status != 200:
+            ok = False
+            L.append(f"!! API /api/tournaments -> HTTP {r.status}")
+        elif total is None:
+            ok = False
+            L.append("!! API /api/tournaments -> en-tête X-Total-Count absent")
+        else:
+            api_count = int(total)
+            L.append(f"[API] /api/tournaments -> {api_count} objets")
     except Exception as e:
         ok = False
         L.append(f"!! API injoignable: {e}")
+    finally:
+        conn.close()
+    return ok, L, {"api_count": api_count}
+
+# Sondes indépendantes: lancées en parallèle, rapportées dans cet ordre.
+CHECKS = (_check_files, _check_json, _check_db, _check_api)
+
+def main():
+    L  = []
+    L.append("=== TenPadel Healthcheck ===")
+
+    # 1-4) FICHIERS, JSON, DB, API — en parallèle pour masquer l'attente réseau
+    with ThreadPoolExecutor(max_workers=len(CHECKS)) as ex:
+        futures = [ex.submit(check) for check in CHECKS]
+        results = [f.result() for f in futures]
+    ok = True
+    facts = {}
+    for check_ok, lines, data in results:
+        ok = ok and check_ok
+        L.extend(lines)
+        facts.update(data)
+    json_count, dated_json = facts["json_count"], facts["dated_json"]
+    db_total, db_dated = facts["db_total"], facts["db_dated"]
+    api_count = facts["api_count"]
 
     # 5) HEURISTIQUES D’ERREURS COURANTES
     L.append("\n[DIAG]")
@@ -110,7 +153,7 @@ def main():
 
     # 6) Résumé + code retour
     L.append("\n[SUMMARY]")
-    L.append(f"OK={ok}  (json={json_count}, db={db_total}, api≈{api_count})")
+    L.append(f"OK={ok}  (json={json_count}, db={db_total}, api={api_count})")
     out_lines(L)
     if not ok:
         sys.exit(1)
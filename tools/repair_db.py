@@ -1,15 +1,40 @@
 """Repair the SQLite database schema and reload tournaments from JSON."""
 from __future__ import annotations
 
-import json
+import errno
+import os
 import shutil
 import sqlite3
 import sys
 from datetime import datetime
 from pathlib import Path
-
-from services.db_import import ImportStats, ensure_schema, import_items
-from tenpadel.config_paths import DB_PATH, JSON_PATH, LOG_DIR
+from typing import Iterator
+
+from services.db_import import (
+    SCHEMA_SQL,
+    ImportStats,
+    connect_db,
+    ensure_schema,
+    import_items,
+)
+from tenpadel import jsonio
+from tenpadel.config_paths import DB_PATH, DB_PATH_STR, JSON_PATH, LOG_DIR
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+# Drop and rebuild the table in one script and one transaction.
+RECREATE_SQL = (
+    "PRAGMA journal_mode=WAL;\n"
+    "BEGIN IMMEDIATE;\n"
+    "DROP TABLE IF EXISTS tournaments;\n"
+    "DROP INDEX IF EXISTS idx_unique_detail_url;\n"
+    "DROP INDEX IF EXISTS idx_start_date;\n"
+    f"{SCHEMA_SQL}"
+    "COMMIT;\n"
+)
 
 
 def backup_database() -> Path | None:
@@ -18,41 +43,134 @@ def backup_database() -> Path | None:
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     backup_path = DB_PATH.with_name(f"{DB_PATH.name}.bak-{timestamp}")
     backup_path.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(DB_PATH, backup_path)
+    # Copy the WAL/SHM sidecars before opening the database: SQLite may drop
+    # them when it fails to read a corrupt app.db.
+    sidecars = []
+    for suffix in ("-wal", "-shm"):
+        sidecar = DB_PATH.with_name(DB_PATH.name + suffix)
+        if sidecar.exists():
+            copy = backup_path.with_name(backup_path.name + suffix)
+            _copy_file(sidecar, copy)
+            sidecars.append(copy)
+    folded = _checkpoint_wal()
+    _copy_file(DB_PATH, backup_path)
+    if folded:
+        # The WAL now lives in app.db, so the copy alone is a full snapshot.
+        for copy in sidecars:
+            copy.unlink()
     return backup_path
 
 
+def _checkpoint_wal() -> bool:
+    """Fold the WAL into ``app.db``; False if the file cannot be checkpointed.
+
+    Uses a bare connection with no PRAGMAs so a corrupt database still gets
+    backed up instead of aborting the repair.
+    """
+
+    con = sqlite3.connect(DB_PATH_STR)
+    try:
+        busy, _, _ = con.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        con.close()
+    return not busy
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    """Copy with os.copy_file_range (in-kernel, reflink where supported)."""
+
+    if not hasattr(os, "copy_file_range"):
+        shutil.copy2(src, dst)
+        return
+    try:
+        with src.open("rb") as fin, dst.open("wb") as fout:
+            remaining = os.fstat(fin.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fin.fileno(), fout.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except OSError as exc:
+        if exc.errno not in (errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+            raise
+        shutil.copy2(src, dst)
+        return
+    shutil.copystat(src, dst)
+
+
 def recreate_schema() -> None:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    con = sqlite3.connect(str(DB_PATH))
-    cur = con.cursor()
-    cur.execute("DROP TABLE IF EXISTS tournaments")
-    cur.execute("DROP INDEX IF EXISTS idx_unique_detail_url")
-    cur.execute("DROP INDEX IF EXISTS idx_start_date")
-    con.commit()
-    con.close()
-    ensure_schema()
+    con = connect_db(bulk=True)
+    try:
+        con.executescript(RECREATE_SQL)
+    finally:
+        con.close()
+    ensure_schema(force=True)
 
 
-def read_json_payload() -> list[dict]:
-    if not JSON_PATH.exists():
-        print(f"⚠️  JSON file missing: {JSON_PATH}")
-        return []
-    raw = json.loads(JSON_PATH.read_text(encoding="utf-8"))
+def _first_byte(path: Path) -> bytes:
+    with path.open("rb") as fh:
+        while True:
+            char = fh.read(1)
+            if not char or not char.isspace():
+                return char
+
+
+def _stream_items(prefix: str) -> Iterator[dict]:
+    with JSON_PATH.open("rb") as fh:
+        yield from ijson.items(fh, prefix, use_float=True)
+
+
+def _load_items() -> Iterator[dict]:
+    raw = jsonio.loads(JSON_PATH.read_bytes())
     if isinstance(raw, list):
-        return [dict(item) for item in raw]
+        yield from raw
+        return
     if isinstance(raw, dict):
         candidates = raw.get("tournaments") or raw.get("items") or []
         if isinstance(candidates, list):
-            return [dict(item) for item in candidates]
+            yield from candidates
+            return
     print(f"⚠️  Unsupported JSON structure in {JSON_PATH}")
-    return []
 
 
-def import_current_json() -> ImportStats:
+def read_json_payload() -> Iterator[dict]:
+    """Yield the tournaments stored in ``JSON_PATH``.
+
+    Uses ijson to stream the items when it is installed, so the file is
+    never held in memory as a whole; falls back to ``jsonio.loads`` otherwise.
+    """
+
+    if not JSON_PATH.exists():
+        print(f"⚠️  JSON file missing: {JSON_PATH}")
+        return
+    if ijson is None:
+        yield from _load_items()
+        return
+
+    head = _first_byte(JSON_PATH)
+    if head == b"[":
+        yield from _stream_items("item")
+    elif head == b"{":
+        found = False
+        for item in _stream_items("tournaments.item"):
+            found = True
+            yield item
+        if not found:
+            yield from _stream_items("items.item")
+    else:
+        print(f"⚠️  Unsupported JSON structure in {JSON_PATH}")
+
+
+def import_current_json(fresh: bool = False) -> ImportStats:
+    print(f"📥 Importing tournaments from {JSON_PATH}")
     items = read_json_payload()
-    print(f"📥 Importing {len(items)} tournaments from {JSON_PATH}")
-    return import_items(items)
+    # fresh: the table was just emptied by recreate_schema.
+    stats = import_items(items, fresh=fresh)
+    print(f"   ↳ Read: {stats.total}")
+    return stats
 
 
 def main() -> int:
@@ -64,7 +182,7 @@ def main() -> int:
     recreate_schema()
     print("✅ Schema recreated")
 
-    stats = import_current_json()
+    stats = import_current_json(fresh=True)
     print(
         "   ↳ Inserted: {0.inserted}  Updated: {0.updated}  Unchanged: {0.skipped}".format(stats)
     )